@@ -1,11 +1,10 @@
 import requests
-import os
-import tempfile
-import zipfile
+import io
+import tarfile
 from urllib.parse import urlparse
 import re
 
-GITHUB_API = "https://api.github.com/repos/{owner}/{repo}/zipball/{branch}"
+GITHUB_TARBALL_API = "https://api.github.com/repos/{owner}/{repo}/tarball/{branch}"
 
 def parse_github_url(url):
     """
@@ -30,43 +29,49 @@ def parse_github_url(url):
             branch = 'main'
     return owner, repo, branch
 
-def download_repo_zip(url_or_fullname, dest_folder=None, token=None):
-    """
-    Se `url_or_fullname` for uma URL -> parse.
-    Se for 'owner/repo' assume main branch.
-    Retorna caminho do zip baixado.
-    """
-    if dest_folder is None:
-        dest_folder = tempfile.mkdtemp()
+def resolve_repo(url_or_fullname):
+    """Aceita URL do GitHub ou 'owner/repo' e retorna (owner, repo, branch)."""
     if url_or_fullname.startswith('http'):
-        owner, repo, branch = parse_github_url(url_or_fullname)
-    else:
-        owner_repo = url_or_fullname.strip()
-        if '/' not in owner_repo:
-            raise ValueError("Formato esperado owner/repo")
-        owner, repo = owner_repo.split('/')
-        branch = 'main'
-    download_url = GITHUB_API.format(owner=owner, repo=repo, branch=branch)
+        return parse_github_url(url_or_fullname)
+    owner_repo = url_or_fullname.strip()
+    if '/' not in owner_repo:
+        raise ValueError("Formato esperado owner/repo")
+    owner, repo = owner_repo.split('/')
+    return owner, repo, 'main'
+
+def _auth_headers(token):
     headers = {}
     if token:
         headers['Authorization'] = f'token {token}'
-    r = requests.get(download_url, headers=headers, stream=True)
-    r.raise_for_status()
-    zip_path = os.path.join(dest_folder, f"{owner}-{repo}-{branch}.zip")
-    with open(zip_path, 'wb') as f:
-        for chunk in r.iter_content(1024*32):
-            f.write(chunk)
-    return zip_path
+    return headers
 
-def unzip_to_folder(zip_path, target_folder=None):
-    if target_folder is None:
-        target_folder = tempfile.mkdtemp()
-    with zipfile.ZipFile(zip_path, 'r') as z:
-        z.extractall(target_folder)
-    # GitHub zips usually contain a single top-level folder, return its path
-    members = z.namelist()
-    top_dirs = set([m.split('/')[0] for m in members if m.strip()!=''])
-    if len(top_dirs) == 1:
-        first = list(top_dirs)[0]
-        return os.path.join(target_folder, first)
-    return target_folder
+def stream_repo_tarball(url_or_fullname, token=None, api_url=GITHUB_TARBALL_API):
+    """
+    Lê o tarball do repositório direto da resposta HTTP (tarfile em modo stream),
+    sem gravar nada em disco. Gera tuplas (caminho_relativo, is_dir, conteudo):
+    - caminho_relativo já sem a pasta de topo que o GitHub adiciona;
+    - conteudo é o código-fonte (str) para arquivos .py e None para o resto.
+    `api_url` permite apontar para outro servidor (ex.: um servidor local nos testes).
+    """
+    owner, repo, branch = resolve_repo(url_or_fullname)
+    download_url = api_url.format(owner=owner, repo=repo, branch=branch)
+    with requests.get(download_url, headers=_auth_headers(token), stream=True) as r:
+        r.raise_for_status()
+        r.raw.decode_content = True
+        with tarfile.open(fileobj=r.raw, mode='r|*') as tar:
+            for member in tar:
+                parts = member.name.strip('/').split('/')
+                # GitHub tarballs usually contain a single top-level folder, drop it
+                rel = '/'.join(parts[1:])
+                if not rel and not member.isdir():
+                    continue
+                if member.isdir():
+                    yield rel, True, None
+                elif member.isfile():
+                    src = None
+                    if rel.endswith('.py'):
+                        data = tar.extractfile(member).read()
+                        # mesma decodificação (e quebra de linha) do open() usado em metrics.py
+                        with io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='ignore') as fh:
+                            src = fh.read()
+                    yield rel, False, src
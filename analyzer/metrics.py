@@ -14,156 +14,187 @@ def list_python_files(root):
                 py_files.append(os.path.join(dirpath, f))
     return py_files
 
+def _read_source(path):
+    with open(path, 'r', encoding='utf-8', errors='ignore') as fh:
+        return fh.read()
+
+def _count_lines(src):
+    # mesmo resultado de len(fh.readlines()) no texto já lido
+    return src.count('\n') + (1 if src and not src.endswith('\n') else 0)
+
+def _join(root, rel):
+    """Junta a raiz com um caminho relativo no formato 'a/b/c' (separador do tar)."""
+    return os.path.join(root, *rel.split('/')) if rel else root
+
 def count_loc(path):
-    total = 0
-    for dirpath, dirnames, filenames in os.walk(path):
-        for f in filenames:
-            if f.endswith('.py'):
-                fp = os.path.join(dirpath, f)
-                with open(fp, 'r', encoding='utf-8', errors='ignore') as fh:
-                    lines = fh.readlines()
-                    # excluir linhas vazias e comentários simples?
-                    total += len(lines)
-    return total
+    # excluir linhas vazias e comentários simples?
+    return sum(_count_lines(_read_source(f)) for f in list_python_files(path))
 
-def ast_counts(py_files):
+# ---- Análise por arquivo ----
+# Cada métrica é calculada uma única vez por arquivo em analyze_source e resumida
+# pelas funções _summarize_*. Tanto a leitura do disco (analyze_project) quanto o
+# pipeline em streaming (pipeline.py) passam por aqui.
+def analyze_source(src):
     """
-    Retorna dict com número de classes, funções por projeto e por arquivo.
+    Calcula as métricas de um único arquivo a partir do código-fonte já lido.
+    Retorna loc, classes, funções, valores de CC, MI (None se não calculado) e a
+    raiz de cada import (None para importações relativas).
     """
-    counts = {'classes':0, 'functions':0, 'modules':len(py_files), 'by_file':{}}
-    for f in py_files:
-        try:
-            with open(f, 'r', encoding='utf-8', errors='ignore') as fh:
-                src = fh.read()
-            tree = ast.parse(src)
-            classes = [n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)]
-            funcs = [n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]
-            counts['classes'] += len(classes)
-            counts['functions'] += len(funcs)
-            counts['by_file'][f] = {'classes':len(classes), 'functions':len(funcs)}
-        except Exception:
-            counts['by_file'][f] = {'classes':0, 'functions':0}
+    result = {'loc': _count_lines(src), 'classes': 0, 'functions': 0,
+              'cc': [], 'mi': None, 'import_roots': []}
+    try:
+        tree = ast.parse(src)
+    except Exception:
+        return result
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            result['classes'] += 1
+        elif isinstance(node, ast.FunctionDef):
+            result['functions'] += 1
+        elif isinstance(node, ast.Import):
+            # e.g., 'import src.api.models' -> 'src'
+            result['import_roots'].extend(n.name.split('.')[0] for n in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            # Se level > 0, é uma importação relativa (ex: 'from .models import X'),
+            # sempre contada como acoplamento interno.
+            result['import_roots'].append(None if node.level > 0 else (node.module or '').split('.')[0])
+    try:
+        # CC primeiro: se o MI falhar, os blocos de CC já coletados continuam valendo
+        result['cc'] = [b.complexity for b in cc_visit(src)]
+        result['mi'] = mi_visit(src, True)
+    except Exception:
+        pass
+    return result
+
+def _analyze_files(py_files):
+    return {f: analyze_source(_read_source(f)) for f in py_files}
+
+def _summarize_ast(file_metrics):
+    counts = {'classes':0, 'functions':0, 'modules':len(file_metrics), 'by_file':{}}
+    for f, m in file_metrics.items():
+        counts['classes'] += m['classes']
+        counts['functions'] += m['functions']
+        counts['by_file'][f] = {'classes':m['classes'], 'functions':m['functions']}
     return counts
 
-def complexity_metrics(py_files):
-    """
-    Usa radon para gerar complexidade por função/classe e índice de mantenabilidade (MI).
-    Retorna média de CC por arquivo, MI médio.
-    """
+def _summarize_complexity(file_metrics):
     cc_values = []
     mi_values = []
-    for p in py_files:
-        try:
-            with open(p, 'r', encoding='utf-8', errors='ignore') as fh:
-                src = fh.read()
-            # CC
-            blocks = cc_visit(src)
-            for b in blocks:
-                cc_values.append(b.complexity)
-            # MI
-            mi = mi_visit(src, True)
-            mi_values.append(mi)
-        except Exception:
-            continue
+    for m in file_metrics.values():
+        cc_values.extend(m['cc'])
+        if m['mi'] is not None:
+            mi_values.append(m['mi'])
     avg_cc = sum(cc_values)/len(cc_values) if cc_values else 0
     avg_mi = sum(mi_values)/len(mi_values) if mi_values else 0
     return {'avg_cc': avg_cc, 'avg_mi': avg_mi, 'num_cc_blocks': len(cc_values)}
 
-# heurística de acoplamento: contar imports entre arquivos do projeto
-def coupling_metric(py_files, project_root):
-    """
-    Conta quantas vezes um arquivo importa outro arquivo do mesmo projeto.
-    Isso é uma heurística para acoplamento interno.
-    """
-    module_lookup = {}
-    
+def _summarize_coupling(file_metrics):
+    """file_metrics indexado pelo caminho relativo à raiz do projeto ('a/b/c.py')."""
+    module_lookup = set()
     # 1. Crie um conjunto de todos os nomes de módulos no projeto
-    for f in py_files:
-        rel = os.path.relpath(f, project_root)
-        
+    for rel in file_metrics:
         # Handle __init__.py files correctly (e.g., src/api/__init__.py -> src.api)
-        if os.path.basename(f) == '__init__.py':
-            rel = os.path.dirname(rel)
+        if rel.split('/')[-1] == '__init__.py':
+            mod = rel.rpartition('/')[0]
         else:
-            rel = rel[:-3] # remove .py
-        
+            mod = rel[:-3] # remove .py
         # Ignora __init__ na raiz
-        if not rel:
-            continue
-
-        module_name = rel.replace(os.sep, '.')
-        if module_name:
-            module_lookup[module_name] = f
-    
+        if mod:
+            module_lookup.add(mod.replace('/', '.'))
     # 2. Encontre os pacotes raiz (ex: 'src', 'app', 'tests')
     root_packages = {mod.split('.')[0] for mod in module_lookup}
-    
+    # 3. Conta imports de pacotes do projeto e todas as importações relativas
     total_links = 0
-    for f in py_files:
-        try:
-            with open(f, 'r', encoding='utf-8', errors='ignore') as fh:
-                src = fh.read()
-            tree = ast.parse(src)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for n in node.names:
-                        name = n.name # e.g., 'src.api.models'
-                        # 3a. Checa se o 'import' é de um pacote do projeto
-                        if name.split('.')[0] in root_packages:
-                            total_links += 1
-                            
-                elif isinstance(node, ast.ImportFrom):
-                    # 3b. Checa 'from ... import ...'
-                    
-                    # Se level > 0, é uma importação relativa (ex: 'from .models import X')
-                    # Contamos todas as importações relativas como acoplamento interno.
-                    if node.level > 0:
-                        total_links += 1
-                    else:
-                        # Importação absoluta (ex: 'from src.api import models')
-                        mod = node.module or ''
-                        if mod.split('.')[0] in root_packages:
-                            total_links += 1
-        except Exception:
-            continue
-            
-    avg_links = total_links / len(py_files) if py_files else 0
+    for m in file_metrics.values():
+        total_links += sum(1 for r in m['import_roots'] if r is None or r in root_packages)
+    avg_links = total_links / len(file_metrics) if file_metrics else 0
     return {'total_import_links': total_links, 'avg_links_per_file': avg_links}
 
+def ast_counts(py_files):
+    """
+    Retorna dict com número de classes, funções por projeto e por arquivo.
+    """
+    return _summarize_ast(_analyze_files(py_files))
+
+def complexity_metrics(py_files):
+    """
+    Usa radon para gerar complexidade por função/classe e índice de mantenabilidade (MI).
+    Retorna média de CC por arquivo, MI médio.
+    """
+    return _summarize_complexity(_analyze_files(py_files))
+
+# heurística de acoplamento: contar imports entre arquivos do projeto
+def coupling_metric(py_files, project_root):
+    """
+    Conta quantas vezes um arquivo importa outro arquivo do mesmo projeto.
+    Isso é uma heurística para acoplamento interno.
+    """
+    file_metrics = {os.path.relpath(f, project_root).replace(os.sep, '/'): m
+                    for f, m in _analyze_files(py_files).items()}
+    return _summarize_coupling(file_metrics)
+
 # heurística simples de separação de domínio:
+DOMAIN_KEYWORDS = ['order','pedido','payment','pagamento','catalog','catalogo','product','produto','cart','carrinho','customer','cliente','inventory','estoque','shipping','logistics','checkout']
+
+def _domain_matches(dirpath, filenames):
+    """Retorna a pasta e/ou os arquivos dela cujo nome contém alguma palavra de domínio."""
+    found = []
+    base = os.path.basename(dirpath).lower()
+    if any(k in base for k in DOMAIN_KEYWORDS):
+        found.append(dirpath)
+    for f in filenames:
+        name = f.lower()
+        if any(k in name for k in DOMAIN_KEYWORDS):
+            found.append(os.path.join(dirpath, f))
+    return found
+
+def _summarize_domain(project_root, tree_entries):
+    found = []
+    for rel_dir, filenames in tree_entries.items():
+        found.extend(_domain_matches(_join(project_root, rel_dir), filenames))
+    unique = list(set(found))
+    return {'domain_segments': len(unique), 'examples': unique[:10]}
+
+def _walk_tree(project_root):
+    """Retorna {pasta_relativa ('a/b', '' = raiz): [arquivos]} como o os.walk enxerga."""
+    tree_entries = {}
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        rel_dir = os.path.relpath(dirpath, project_root)
+        rel_dir = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/')
+        tree_entries[rel_dir] = filenames
+    return tree_entries
+
 def domain_separation_heuristic(project_root):
     """
     Busca pastas/arquivos com nomes de domínio comuns: 'order', 'order_service', 'payment', 'catalog', 'customer'
     Retorna contagem dessas pastas e arquivos.
     """
-    keywords = ['order','pedido','payment','pagamento','catalog','catalogo','product','produto','cart','carrinho','customer','cliente','inventory','estoque','shipping','logistics','checkout']
-    found = []
-    for dirpath, dirnames, filenames in os.walk(project_root):
-        base = os.path.basename(dirpath).lower()
-        if any(k in base for k in keywords):
-            found.append(dirpath)
-        for f in filenames:
-            name = f.lower()
-            if any(k in name for k in keywords):
-                found.append(os.path.join(dirpath, f))
-    unique = list(set(found))
-    return {'domain_segments': len(unique), 'examples': unique[:10]}
+    return _summarize_domain(os.fspath(project_root), _walk_tree(project_root))
 
-# função agregadora
-def analyze_project(project_root):
-    py_files = list_python_files(project_root)
-    loc = count_loc(project_root)
-    ast_info = ast_counts(py_files)
-    complexity = complexity_metrics(py_files)
-    coupling = coupling_metric(py_files, project_root)
-    domain = domain_separation_heuristic(project_root)
+def aggregate_file_metrics(project_root, file_metrics, tree_entries):
+    """
+    Monta o dicionário final da análise a partir de resultados de analyze_source.
+    - file_metrics: {caminho_relativo_do_arquivo_py ('a/b.py'): resultado de analyze_source}
+    - tree_entries: {caminho_relativo_da_pasta: [nomes de arquivos]} com todas as pastas do projeto ('' = raiz)
+    """
+    root = os.fspath(project_root)
     return {
         'path': project_root,
-        'num_py_files': len(py_files),
-        'loc': loc,
-        'ast': ast_info,
-        'complexity': complexity,
-        'coupling': coupling,
-        'domain': domain
-    }
\ No newline at end of file
+        'num_py_files': len(file_metrics),
+        'loc': sum(m['loc'] for m in file_metrics.values()),
+        'ast': _summarize_ast({_join(root, rel): m for rel, m in file_metrics.items()}),
+        'complexity': _summarize_complexity(file_metrics),
+        'coupling': _summarize_coupling(file_metrics),
+        'domain': _summarize_domain(root, tree_entries)
+    }
+
+# função agregadora
+def analyze_project(project_root):
+    tree_entries = _walk_tree(project_root)
+    file_metrics = {}
+    for rel_dir, filenames in tree_entries.items():
+        for f in filenames:
+            if f.endswith('.py'):
+                rel = f"{rel_dir}/{f}" if rel_dir else f
+                file_metrics[rel] = analyze_source(_read_source(_join(os.fspath(project_root), rel)))
+    return aggregate_file_metrics(project_root, file_metrics, tree_entries)
@@ -0,0 +1,105 @@
+"""
+pipeline.py — download e análise em paralelo (streaming)
+
+O tarball do GitHub é lido direto da resposta HTTP e cada arquivo .py é enviado
+para as threads de análise por uma fila limitada, assim rede/descompactação e CPU
+trabalham ao mesmo tempo. Quando a fila enche, a leitura do download espera
+(backpressure) em vez de acumular arquivos na memória.
+
+A análise (ast.parse + radon) é Python puro e segura o GIL: mais de uma thread
+não analisa arquivos em paralelo, só sobrepõe a análise com a leitura da rede.
+Por isso o padrão é uma única thread. Um pool de processos não compensa aqui:
+cada arquivo leva poucos milissegundos, e serializar código e resultado entre
+processos (além de subir os workers) custaria mais que a análise em si.
+"""
+import queue
+import threading
+from contextlib import closing
+
+from analyzer.github_fetcher import GITHUB_TARBALL_API, resolve_repo, stream_repo_tarball
+from analyzer import metrics
+
+DEFAULT_WORKERS = 1
+DEFAULT_QUEUE_SIZE = 64
+
+_DONE = object()
+_PUT_TIMEOUT = 0.1
+
+
+def _worker(q, results, errors, lock):
+    while True:
+        item = q.get()
+        if item is _DONE:
+            return
+        rel, src = item
+        try:
+            m = metrics.analyze_source(src)
+        except Exception as e:
+            # Continua consumindo a fila para o leitor do download nunca travar;
+            # o erro é relançado na thread principal ao final.
+            with lock:
+                errors.append(e)
+            continue
+        with lock:
+            results[rel] = m
+
+
+def _put(q, item, threads):
+    """q.put que desiste se nenhum worker estiver vivo para esvaziar a fila."""
+    while True:
+        try:
+            q.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            if not any(t.is_alive() for t in threads):
+                return False
+
+
+def analyze_github_repo_stream(url_or_fullname, token=None, workers=DEFAULT_WORKERS,
+                               max_queue=DEFAULT_QUEUE_SIZE, api_url=GITHUB_TARBALL_API):
+    """
+    Baixa o repositório em streaming e analisa os arquivos .py à medida que chegam.
+    Retorna o mesmo dicionário de metrics.analyze_project; 'path' é um rótulo
+    owner-repo-branch, já que nada é extraído para o disco.
+    Se a análise de algum arquivo falhar, o download é interrompido e o erro relançado.
+    """
+    owner, repo, branch = resolve_repo(url_or_fullname)
+    project_root = f"{owner}-{repo}-{branch}"
+
+    q = queue.Queue(maxsize=max_queue)
+    results = {}
+    errors = []
+    lock = threading.Lock()
+    threads = [threading.Thread(target=_worker, args=(q, results, errors, lock), daemon=True)
+               for _ in range(max(1, workers))]
+    for t in threads:
+        t.start()
+
+    tree_entries = {'': []}
+    try:
+        with closing(stream_repo_tarball(url_or_fullname, token=token, api_url=api_url)) as members:
+            for rel, is_dir, src in members:
+                if is_dir:
+                    tree_entries.setdefault(rel, [])
+                    continue
+                # registra todas as pastas intermediárias, como o os.walk enxergaria
+                parent, _, name = rel.rpartition('/')
+                tree_entries.setdefault(parent, []).append(name)
+                while parent:
+                    parent = parent.rpartition('/')[0]
+                    tree_entries.setdefault(parent, [])
+                # bloqueia quando a fila está cheia
+                if src is not None and not _put(q, (rel, src), threads):
+                    break
+                if errors:
+                    break
+    finally:
+        for _ in threads:
+            if not _put(q, _DONE, threads):
+                break
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+    return metrics.aggregate_file_metrics(project_root, results, tree_entries)
@@ -1,9 +1,15 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
 import json
 from pathlib import Path
 
+# streamlit, pandas e plotly levam segundos para importar. Só show_report precisa
+# deles, então são carregados sob demanda: quem usa apenas metrics/scoring ou
+# save_json_report (ex.: workers em lote) não paga esse custo.
+def _load_ui():
+    import streamlit as st
+    import pandas as pd
+    import plotly.express as px
+    return st, pd, px
+
 
 def show_report(metrics_a, metrics_b, scores_a, scores_b, name_a, name_b, weights):
     """
@@ -14,6 +20,7 @@ def show_report(metrics_a, metrics_b, scores_a, scores_b, name_a, name_b, weight
     - Diferenças por métrica
     - Conclusão automática
     """
+    st, pd, px = _load_ui()
 
     st.title("📊 Relatório Comparativo de Métricas Arquiteturais")
     st.write(f"Comparação entre **{name_a}** e **{name_b}** em métricas reais e scores ponderados.")
@@ -18,16 +18,16 @@ if "scores" in st.session_state:
     del st.session_state["scores"]
 
 try:
-    from analyzer.github_fetcher import download_repo_zip, unzip_to_folder
     from analyzer.extractor import extract_uploaded_zip
     from analyzer.metrics import analyze_project
     from analyzer.scoring import compute_scores
+    from analyzer.pipeline import analyze_github_repo_stream
     
     # IMPORTANTE: Importa as funções do report.py
     from analyzer.report import show_report, save_json_report 
 except ImportError as e:
     st.error(f"Erro de importação: {e}")
-    st.error("Verifique se todos os arquivos (github_fetcher.py, extractor.py, metrics.py, scoring.py, report.py) existem dentro da pasta 'analyzer' e se a pasta 'analyzer' contém um arquivo __init__.py.")
+    st.error("Verifique se todos os arquivos (github_fetcher.py, pipeline.py, extractor.py, metrics.py, scoring.py, report.py) existem dentro da pasta 'analyzer' e se a pasta 'analyzer' contém um arquivo __init__.py.")
     st.stop()
 
 
@@ -74,7 +74,7 @@ if st.button("▶️ Rodar análise"):
 if "force_run" in st.session_state:
 
     tmproot = tempfile.mkdtemp()
-    proj_paths = []
+    metrics = []
     
     # Define os nomes explicitamente para usar no relatório
     names = ["Projeto DDD", "Projeto Tradicional"]
@@ -90,8 +90,9 @@ if "force_run" in st.session_state:
                     st.error("Informe as duas URLs antes de rodar.")
                     st.stop() # Use st.stop() para parar a execução
                 
-                zip_path = download_repo_zip(url, dest_folder=tmproot, token=token if token else None)
-                base = unzip_to_folder(zip_path, None)
+                # Baixa o tarball em streaming e analisa os .py enquanto chegam
+                metrics.append(analyze_github_repo_stream(url, token=token if token else None))
+                st.success(f"Projeto {idx} baixado e analisado")
             else:
                 up = up_a if idx==1 else up_b
                 if up is None:
@@ -103,12 +104,10 @@ if "force_run" in st.session_state:
                     fh.write(up.read())
                 
                 base = extract_uploaded_zip(tmpf)
+                st.success(f"Projeto {idx} extraído em {base}")
 
-            st.success(f"Projeto {idx} extraído em {base}")
-            proj_paths.append(base)
-
-        st.info("Extraindo métricas...")
-        metrics = [analyze_project(p) for p in proj_paths]
+                st.info("Extraindo métricas...")
+                metrics.append(analyze_project(base))
 
         W = {'manutenibilidade': w_man, 'complexidade': w_comp, 'coupling': w_cpl, 'structure': w_struct}
         s = sum(W.values())
@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# O núcleo só pode trazer a biblioteca padrão, o radon e o próprio pacote
+ALLOWED_THIRD_PARTY = {'radon', 'analyzer'}
+
+# Orçamento do import a frio do núcleo (hoje fica em poucos ms; pandas sozinho já passa disso)
+IMPORT_BUDGET_SECONDS = 0.25
+
+SCRIPT = """
+import json, sys, time
+
+def third_party():
+    return {m.split('.')[0] for m in sys.modules} - set(sys.stdlib_module_names)
+
+# hooks de site (ex.: _distutils_hack, certifi) já carregados antes do import
+preloaded = third_party()
+t = time.perf_counter()
+import analyzer.metrics, analyzer.scoring, analyzer.report
+elapsed = time.perf_counter() - t
+print(json.dumps({'elapsed': elapsed, 'imported': sorted(third_party() - preloaded)}))
+"""
+
+
+def _cold_import():
+    # Novo interpretador a cada execução para medir o import sem cache de sys.modules
+    out = subprocess.run([sys.executable, '-c', SCRIPT], cwd=ROOT, capture_output=True,
+                         text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_core_imports_only_stdlib_and_radon():
+    result = _cold_import()
+    assert set(result['imported']) <= ALLOWED_THIRD_PARTY, result['imported']
+
+
+def test_core_cold_import_time_budget():
+    best = min(_cold_import()['elapsed'] for _ in range(3))
+    assert best < IMPORT_BUDGET_SECONDS, f"import do núcleo levou {best:.3f}s"
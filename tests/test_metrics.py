@@ -15,3 +15,15 @@ def test_analyze_project_returns_expected_keys(tmp_path):
     assert 'domain' in result
     assert isinstance(result['loc'], int)
     assert result['num_py_files'] == 1
+
+def test_analyze_project_keeps_cc_when_mi_fails(tmp_path, monkeypatch):
+    (tmp_path / "sample.py").write_text("def soma(a, b):\n    return a + b\n")
+
+    def boom(src, multi):
+        raise ValueError("mi")
+    monkeypatch.setattr("analyzer.metrics.mi_visit", boom)
+
+    result = analyze_project(tmp_path)
+
+    assert result['complexity']['num_cc_blocks'] == 1
+    assert result['complexity']['avg_mi'] == 0
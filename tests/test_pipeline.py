@@ -0,0 +1,152 @@
+import io
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from analyzer import metrics, pipeline
+from analyzer.metrics import analyze_project
+from analyzer.pipeline import analyze_github_repo_stream
+
+FILES = {
+    'app/__init__.py': "",
+    'app/orders/service.py': "from app.orders import models\n\nclass OrderService:\n    def total(self, items):\n        if not items:\n            return 0\n        return sum(i.price for i in items)\n",
+    'app/orders/models.py': "from .base import Base\n\nclass Order(Base):\n    pass\n",
+    'app/orders/base.py': "class Base:\n    def save(self):\n        return True\n",
+    'app/payment.py': "import os\nimport app.orders\n\ndef pay(v):\n    return v > 0\n",
+    'README.md': "# demo\n",
+    'broken.py': "def oops(:\n",
+}
+NUM_PY_FILES = sum(1 for rel in FILES if rel.endswith('.py'))
+
+
+def _tarball():
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tar:
+        for rel, content in FILES.items():
+            data = content.encode('utf-8')
+            info = tarfile.TarInfo(f"owner-repo-abc123/{rel}")
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+@pytest.fixture
+def tarball_server():
+    body = _tarball()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/owner/repo/main':
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/{{owner}}/{{repo}}/{{branch}}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_analysis_matches_analyze_project(tmp_path, tarball_server):
+    root = tmp_path / "proj"
+    for rel, content in FILES.items():
+        f = root / rel
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.write_text(content)
+    expected = analyze_project(str(root))
+
+    result = analyze_github_repo_stream("owner/repo", workers=2, max_queue=1, api_url=tarball_server)
+
+    assert result['num_py_files'] == expected['num_py_files']
+    assert result['loc'] == expected['loc']
+    for key in ('classes', 'functions', 'modules'):
+        assert result['ast'][key] == expected['ast'][key]
+    assert result['complexity'] == pytest.approx(expected['complexity'])
+    assert result['coupling'] == pytest.approx(expected['coupling'])
+    assert result['domain']['domain_segments'] == expected['domain']['domain_segments']
+
+
+def test_stream_analysis_raises_on_http_error(tarball_server):
+    with pytest.raises(requests.HTTPError):
+        analyze_github_repo_stream("owner/missing", api_url=tarball_server)
+
+
+def _run_in_thread(fn, timeout=10):
+    """Roda fn numa thread para que um travamento vire falha do teste, não um hang."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = fn()
+        except BaseException as e:
+            outcome['error'] = e
+
+    t = threading.Thread(target=target, daemon=True)
+    t.start()
+    return t, outcome
+
+
+def test_stream_analysis_reraises_worker_error(tarball_server, monkeypatch):
+    def boom(src):
+        raise RuntimeError("falha na análise")
+    monkeypatch.setattr(metrics, 'analyze_source', boom)
+
+    t, outcome = _run_in_thread(lambda: analyze_github_repo_stream(
+        "owner/repo", workers=1, max_queue=1, api_url=tarball_server))
+    t.join(10)
+
+    assert not t.is_alive(), "pipeline travou após erro no worker"
+    assert isinstance(outcome.get('error'), RuntimeError)
+
+
+def test_stream_analysis_applies_backpressure(tarball_server, monkeypatch):
+    workers, max_queue = 1, 1
+    started = threading.Event()
+    release = threading.Event()
+    yielded = []
+
+    original_analyze = metrics.analyze_source
+    def gated_analyze(src):
+        started.set()
+        release.wait(10)
+        return original_analyze(src)
+    monkeypatch.setattr(metrics, 'analyze_source', gated_analyze)
+
+    original_stream = pipeline.stream_repo_tarball
+    def counting_stream(*args, **kwargs):
+        for rel, is_dir, src in original_stream(*args, **kwargs):
+            if src is not None:
+                yielded.append(rel)
+            yield rel, is_dir, src
+    monkeypatch.setattr(pipeline, 'stream_repo_tarball', counting_stream)
+
+    t, outcome = _run_in_thread(lambda: analyze_github_repo_stream(
+        "owner/repo", workers=workers, max_queue=max_queue, api_url=tarball_server))
+
+    # o primeiro arquivo já está sendo analisado enquanto o download continua
+    assert started.wait(5)
+    # um arquivo no worker, max_queue na fila e um esperando no q.put
+    limit = workers + max_queue + 1
+    deadline = time.monotonic() + 5
+    while len(yielded) < limit and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.3)
+    assert len(yielded) == limit < NUM_PY_FILES
+    assert t.is_alive()
+
+    release.set()
+    t.join(10)
+    assert not t.is_alive()
+    assert outcome['result']['num_py_files'] == NUM_PY_FILES